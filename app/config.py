@@ -1,4 +1,5 @@
 import os
+import tempfile
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -17,8 +18,46 @@ class Settings:
     SESSION_EXPIRE_HOURS: int = int(os.getenv("SESSION_EXPIRE_HOURS", "168"))  # 7 days default
     SESSION_CLEANUP_INTERVAL_HOURS: int = int(os.getenv("SESSION_CLEANUP_INTERVAL_HOURS", "24"))  # Daily cleanup
 
+    # Startup
+    SCHEMA_CHECK_ON_STARTUP: bool = os.getenv("SCHEMA_CHECK_ON_STARTUP", "True").lower() == "true"  # Disable in production once migrated
+    DB_POOL_WARM_CONNECTIONS: int = int(os.getenv("DB_POOL_WARM_CONNECTIONS", "1"))
+
+    # Server
+    HOST: str = os.getenv("HOST", "127.0.0.1")
+    PORT: int = int(os.getenv("PORT", "8080"))
+    WORKERS: int = int(os.getenv("WORKERS", "0"))  # Production mode; 0 = one per CPU core, capped by DB_MAX_CONNECTIONS
+    REUSE_PORT: bool = os.getenv("REUSE_PORT", "False").lower() == "true"  # Bind each worker with SO_REUSEPORT
+    GRACEFUL_SHUTDOWN_TIMEOUT: int = int(os.getenv("GRACEFUL_SHUTDOWN_TIMEOUT", "30"))  # Seconds to drain in-flight requests
+
+    # Per-process resources. A single process uses these as they are; production
+    # mode splits DB_MAX_CONNECTIONS between its workers and passes each one its share.
+    DB_MAX_CONNECTIONS: int = int(os.getenv("DB_MAX_CONNECTIONS", "20"))  # Total across all workers in production mode
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT: int = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+    THREADPOOL_SIZE: int = int(os.getenv("THREADPOOL_SIZE", "40"))  # Threads for sync endpoints; must exceed MAX_CONCURRENT_REQUESTS
+    MAX_CONCURRENT_REQUESTS: int = int(os.getenv("MAX_CONCURRENT_REQUESTS", "0"))  # 0 = DB_POOL_SIZE + DB_MAX_OVERFLOW
+    HASH_CONCURRENCY: int = int(os.getenv("HASH_CONCURRENCY", str(os.cpu_count() or 1)))  # Concurrent bcrypt hashes
+
+    # Auth caches and cross-worker invalidation
+    AUTH_CACHE_TTL_SECONDS: int = int(os.getenv("AUTH_CACHE_TTL_SECONDS", "60"))  # 0 disables the user and session caches
+    AUTH_CACHE_MAX_ENTRIES: int = int(os.getenv("AUTH_CACHE_MAX_ENTRIES", "10000"))
+    CACHE_INVALIDATION_BACKEND: str = os.getenv("CACHE_INVALIDATION_BACKEND", "memory")  # memory, unix or database; production mode defaults to unix
+    CACHE_INVALIDATION_POLL_MS: int = int(os.getenv("CACHE_INVALIDATION_POLL_MS", "200"))  # Max revocation delay for the database backend
+    CACHE_INVALIDATION_SOCKET_DIR: str = os.getenv(
+        "CACHE_INVALIDATION_SOCKET_DIR", os.path.join(tempfile.gettempdir(), "registration-backend-bus")
+    )
+
+    # Email availability Bloom filter
+    EMAIL_FILTER_CAPACITY: int = int(os.getenv("EMAIL_FILTER_CAPACITY", "100000"))  # Grown at startup if there are more users
+    EMAIL_FILTER_ERROR_RATE: float = float(os.getenv("EMAIL_FILTER_ERROR_RATE", "0.01"))
+
     # Application
     APP_NAME: str = os.getenv("APP_NAME", "Registration Backend")
     DEBUG: bool = os.getenv("DEBUG", "True").lower() == "true"
 
+    def request_concurrency_limit(self) -> int:
+        """Requests admitted at once: MAX_CONCURRENT_REQUESTS, or one per pooled connection."""
+        return self.MAX_CONCURRENT_REQUESTS or self.DB_POOL_SIZE + self.DB_MAX_OVERFLOW
+
 settings = Settings()
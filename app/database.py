@@ -1,12 +1,31 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 from .config import settings
 
+def _pool_options() -> dict:
+    """Size the connection pool; production workers get their share of DB_MAX_CONNECTIONS."""
+    url = make_url(settings.DATABASE_URL)
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        # In-memory SQLite uses a single shared connection, not a QueuePool
+        return {}
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+    }
+
+def _connect_args() -> dict:
+    return {"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {}
+
 # Create SQLAlchemy engine
 engine = create_engine(
     settings.DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {}
+    connect_args=_connect_args(),
+    **_pool_options()
 )
 
 # Create SessionLocal class
@@ -15,6 +34,56 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 # Create Base class for models
 Base = declarative_base()
 
+def check_schema():
+    """Create any missing tables. Safe to run repeatedly."""
+    # Import models so they are registered on Base.metadata
+    from . import models  # noqa: F401
+    # Another worker may create a table between our check and CREATE TABLE;
+    # each retry skips the tables that exist by then
+    tables = len(Base.metadata.tables)
+    for attempt in range(tables + 1):
+        try:
+            Base.metadata.create_all(bind=engine)
+            return
+        except OperationalError:
+            if attempt == tables:
+                raise
+
+def warm_connection_pool(count: int) -> int:
+    """Open up to `count` pooled connections so early requests skip the connect cost."""
+    connections = []
+    try:
+        for _ in range(count):
+            connections.append(engine.connect())
+    finally:
+        for connection in connections:
+            connection.close()
+    return len(connections)
+
+def create_background_engine(pool_size: int = 0):
+    """Engine for background work that must not hold a request connection.
+
+    With pool_size 0 connections are opened per use and closed afterwards,
+    which suits one-off scans; a small pool suits frequent short queries.
+    Production mode counts these connections in each worker's budget.
+    In-memory SQLite has only the shared connection, so it gets the main engine.
+    """
+    if not _pool_options():
+        return engine
+    if pool_size <= 0:
+        return create_engine(settings.DATABASE_URL, connect_args=_connect_args(), poolclass=NullPool)
+    return create_engine(
+        settings.DATABASE_URL,
+        connect_args=_connect_args(),
+        pool_size=pool_size,
+        max_overflow=0,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+    )
+
+def dispose_engine():
+    """Close all pooled connections."""
+    engine.dispose()
+
 # Dependency to get database session
 def get_db():
     db = SessionLocal()
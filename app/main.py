@@ -1,53 +1,122 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+import anyio.to_thread
+import asyncio
 import logging
-from .database import engine, Base
+import threading
+from .database import check_schema, warm_connection_pool, dispose_engine
 from .routes import auth, session
 from .config import settings
+from .utils.auth import warm_password_hasher
+from .utils.tasks import periodic_session_cleanup
+from .utils.invalidation import invalidation_bus
+from .utils.email_filter import build_email_filter
+from .utils.middleware import ConcurrencyLimitMiddleware
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
-
-# Create FastAPI application
-app = FastAPI(
-    title=settings.APP_NAME,
-    description="A secure user authentication backend with registration and sign-in functionality",
-    version="1.0.0",
-    docs_url="/docs",
-    redoc_url="/redoc"
-)
-
-# Add CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["http://localhost:3000"],  # Frontend development server
-    allow_credentials=True,
-    allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-    allow_headers=["*"],
-)
-
-# Include routers
-app.include_router(auth.router)
-app.include_router(session.router)
-
-@app.get("/")
-def read_root():
-    """Root endpoint with API information."""
-    return {
-        "message": "Registration Backend API",
-        "version": "1.0.0",
-        "docs": "/docs",
-        "redoc": "/redoc"
-    }
-
-@app.get("/health")
-def health_check():
-    """Health check endpoint."""
-    return {"status": "healthy", "service": settings.APP_NAME}
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Run startup checks and warm-up once per worker, then drain background work on shutdown."""
+    # Sync endpoints run in this pool; it must stay larger than the request limit
+    anyio.to_thread.current_default_thread_limiter().total_tokens = settings.THREADPOOL_SIZE
+    if settings.THREADPOOL_SIZE <= settings.request_concurrency_limit():
+        logger.warning(
+            "THREADPOOL_SIZE=%d is not larger than the %d concurrent requests admitted; "
+            "requests can stall waiting for database connections",
+            settings.THREADPOOL_SIZE, settings.request_concurrency_limit(),
+        )
+
+    if settings.SCHEMA_CHECK_ON_STARTUP:
+        check_schema()
+    else:
+        logger.info("Skipping schema check on startup")
+
+    warmed = warm_connection_pool(settings.DB_POOL_WARM_CONNECTIONS)
+    logger.info("Warmed %d database connections", warmed)
+    warm_password_hasher()
+    invalidation_bus.start()
+
+    # Built in the background; until it is ready, email checks go to the database.
+    # It gets its own thread so the long scan never holds a request threadpool token.
+    build_stop_event = threading.Event()
+    build_thread = threading.Thread(
+        target=build_email_filter, args=(build_stop_event,), name="email-filter-build", daemon=True
+    )
+    build_thread.start()
+
+    stop_event = asyncio.Event()
+    background_tasks = []
+    if settings.SESSION_CLEANUP_INTERVAL_HOURS > 0:
+        background_tasks.append(asyncio.create_task(
+            periodic_session_cleanup(stop_event, settings.SESSION_CLEANUP_INTERVAL_HOURS * 3600)
+        ))
+
+    try:
+        yield
+    finally:
+        # Let in-flight background work finish before closing the pool
+        stop_event.set()
+        build_stop_event.set()
+        await asyncio.gather(*background_tasks, return_exceptions=True)
+        # The scan stops within one batch once the event is set
+        build_thread.join()
+        invalidation_bus.stop()
+        dispose_engine()
+
+def create_app() -> FastAPI:
+    """Create and configure the FastAPI application.
+
+    Importing this module does not touch the database; schema checks and
+    warm-up happen in the lifespan when the server starts.
+    """
+    app = FastAPI(
+        title=settings.APP_NAME,
+        description="A secure user authentication backend with registration and sign-in functionality",
+        version="1.0.0",
+        docs_url="/docs",
+        redoc_url="/redoc",
+        lifespan=lifespan
+    )
+
+    # Admit no more requests than there are pooled connections; see ConcurrencyLimitMiddleware
+    app.add_middleware(ConcurrencyLimitMiddleware, limit=settings.request_concurrency_limit())
+
+    # Add CORS middleware
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["http://localhost:3000"],  # Frontend development server
+        allow_credentials=True,
+        allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
+        allow_headers=["*"],
+        expose_headers=["ETag"],
+    )
+
+    # Include routers
+    app.include_router(auth.router)
+    app.include_router(session.router)
+
+    @app.get("/")
+    def read_root():
+        """Root endpoint with API information."""
+        return {
+            "message": "Registration Backend API",
+            "version": "1.0.0",
+            "docs": "/docs",
+            "redoc": "/redoc"
+        }
+
+    @app.get("/health")
+    def health_check():
+        """Health check endpoint."""
+        return {"status": "healthy", "service": settings.APP_NAME}
+
+    return app
+
+app = create_app()
 
 if __name__ == "__main__":
     import uvicorn
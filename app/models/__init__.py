@@ -1,5 +1,6 @@
 # Models package
 from .user import User
 from .session import Session
+from .cache_invalidation import CacheInvalidation
 
-__all__ = ["User", "Session"]
+__all__ = ["User", "Session", "CacheInvalidation"]
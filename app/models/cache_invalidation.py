@@ -0,0 +1,16 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy.sql import func
+from ..database import Base
+
+class CacheInvalidation(Base):
+    """Change-log of cache invalidations, polled by every worker."""
+    __tablename__ = "cache_invalidations"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    kind = Column(String(20), nullable=False)
+    key = Column(String(255), nullable=False)
+    origin = Column(String(36), nullable=False)  # Publishing worker, which skips its own events
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+
+    def __repr__(self):
+        return f"<CacheInvalidation(id={self.id}, kind={self.kind}, key={self.key})>"
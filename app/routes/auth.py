@@ -1,11 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, status, Request
+from pydantic import EmailStr
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from ..database import get_db
 from ..models.user import User
-from ..schemas.user import UserCreate, UserLogin, UserResponse, Token, LogoutResponse
+from ..schemas.user import UserCreate, UserLogin, UserResponse, Token, LogoutResponse, EmailAvailabilityResponse
 from ..utils.auth import get_password_hash, verify_password, create_access_token, create_access_token_with_session
 from ..utils.dependencies import get_current_user
 from ..utils.session import create_session, extract_device_info, terminate_all_user_sessions
+from ..utils.email_filter import email_filter, publish_email_registered
+from ..utils.responses import user_to_dict, fast_json_response, compute_etag, conditional_json_response
 import re
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
@@ -31,6 +35,20 @@ def convert_user_to_response(user: User) -> UserResponse:
         createdAt=user.created_at.isoformat()
     )
 
+def email_exists(db: Session, email: str) -> bool:
+    """Check users.email through the unique index."""
+    return db.query(User.id).filter(User.email == email).first() is not None
+
+@router.get("/email-available", response_model=EmailAvailabilityResponse)
+def check_email_available(email: EmailStr = Query(..., description="Email address to check"), db: Session = Depends(get_db)):
+    """Check whether an email can still be used to register.
+
+    Answered from the in-memory filter of registered emails when it rules the
+    email out; only possible matches are confirmed against the database.
+    """
+    available = not (email_filter.might_contain(email) and email_exists(db, email))
+    return fast_json_response({"email": email, "available": available})
+
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 def register_user(user_data: UserCreate, db: Session = Depends(get_db)):
     """Register a new user."""
@@ -49,12 +67,16 @@ def register_user(user_data: UserCreate, db: Session = Depends(get_db)):
             detail="Password must be at least 8 characters and contain at least one uppercase letter, one number and one special character"
         )
 
-    # Check if email already exists
-    if db.query(User).filter(User.email == user_data.email).first():
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Email already registered"
-        )
+    email_taken = HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Email already registered"
+    )
+
+    # Only query when the filter cannot rule the email out, so likely
+    # duplicates are rejected before paying for bcrypt. New emails go
+    # straight to the insert and rely on the unique index.
+    if email_filter.might_contain(user_data.email) and email_exists(db, user_data.email):
+        raise email_taken
 
     # Create full name from first and last name
     full_name = f"{user_data.firstName} {user_data.lastName}".strip()
@@ -68,8 +90,13 @@ def register_user(user_data: UserCreate, db: Session = Depends(get_db)):
     )
 
     db.add(db_user)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise email_taken
     db.refresh(db_user)
+    publish_email_registered(db_user.email)
 
     return convert_user_to_response(db_user)
 
@@ -103,12 +130,16 @@ def login_user(user_credentials: UserLogin, request: Request, db: Session = Depe
         session_id=str(session.session_id)
     )
 
-    return {"access_token": access_token, "token_type": "bearer"}
+    return fast_json_response({"access_token": access_token, "token_type": "bearer"})
 
 @router.get("/me", response_model=UserResponse)
-def get_current_user_info(current_user: User = Depends(get_current_user)):
-    """Get current authenticated user information."""
-    return convert_user_to_response(current_user)
+def get_current_user_info(request: Request, current_user: User = Depends(get_current_user)):
+    """Get current authenticated user information.
+
+    Supports conditional requests: send the last ETag in If-None-Match to get 304 when unchanged.
+    """
+    etag = compute_etag("me", current_user.id, current_user.email, current_user.name, current_user.created_at)
+    return conditional_json_response(request, etag, lambda: user_to_dict(current_user))
 
 @router.post("/logout", response_model=LogoutResponse)
 def logout_user(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
@@ -9,8 +9,9 @@ from ..schemas.session import (
 from ..utils.dependencies import get_current_user
 from ..utils.session import (
     get_user_sessions, terminate_session, cleanup_expired_sessions,
-    terminate_all_user_sessions, extract_device_info
+    terminate_all_user_sessions, extract_device_info, get_user_sessions_version
 )
+from ..utils.responses import session_list_to_dict, compute_etag, conditional_json_response
 
 router = APIRouter(prefix="/sessions", tags=["Session Management"])
 
@@ -27,18 +28,24 @@ def convert_session_to_response(session) -> SessionResponse:
 
 @router.get("/", response_model=SessionListResponse)
 def get_active_sessions(
+    request: Request,
     current_user: User = Depends(get_current_user),
     db: DBSession = Depends(get_db)
 ):
-    """Get all active sessions for the current user."""
-    sessions = get_user_sessions(db, str(current_user.id), include_expired=False)
-    
-    session_responses = [convert_session_to_response(session) for session in sessions]
-    
-    return SessionListResponse(
-        sessions=session_responses,
-        total=len(session_responses)
-    )
+    """Get all active sessions for the current user.
+
+    Supports conditional requests: the ETag is derived from a summary of the
+    session set, so a 304 is answered without loading any sessions.
+    """
+    user_id = str(current_user.id)
+    # Computed before the list so a concurrent change can only make the ETag stale, never the body
+    etag = compute_etag("sessions", user_id, *get_user_sessions_version(db, user_id))
+
+    def build_content():
+        sessions = get_user_sessions(db, user_id, include_expired=False)
+        return session_list_to_dict(sessions)
+
+    return conditional_json_response(request, etag, build_content)
 
 @router.delete("/terminate", response_model=SessionTerminateResponse)
 def terminate_session_endpoint(
@@ -25,6 +25,10 @@ class UserResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class EmailAvailabilityResponse(BaseModel):
+    email: EmailStr = Field(..., description="Normalized email address that was checked")
+    available: bool = Field(..., description="Whether the email can be used to register")
+
 class Token(BaseModel):
     access_token: str
     token_type: str = "bearer"
@@ -0,0 +1,315 @@
+"""
+Multi-worker production server.
+
+The supervisor spawns WORKERS uvicorn processes. By default it binds the
+listening socket once and shares it with every worker; with REUSE_PORT each
+worker binds its own socket with SO_REUSEPORT and the kernel balances
+connections between them.
+
+Signals handled by the supervisor:
+- SIGTERM / SIGINT: stop all workers, letting in-flight requests finish
+- SIGHUP: rolling restart, one worker at a time; each replacement is started
+  and ready before the old worker is asked to drain
+
+With the shared socket, pending connections stay queued on the one listener
+through a restart, so no request is dropped. With REUSE_PORT every worker has
+its own accept queue, and on Linux closing a listener resets the connections
+still queued on it unless net.ipv4.tcp_migrate_req=1 (Linux 5.14+) hands them
+to another worker in the group. Without it, use the shared socket when
+restarts must not drop requests.
+
+Workers that exit are respawned; a worker that keeps failing before it is
+ready is respawned with exponential backoff, and the supervisor gives up after
+MAX_START_FAILURES failures in a row.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import threading
+import time
+from typing import Dict, List, Optional
+import uvicorn
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+multiprocessing.allow_connection_pickling()
+spawn = multiprocessing.get_context("spawn")
+
+WORKER_READY_TIMEOUT = 60  # Seconds to wait for a replacement worker to start
+ACCEPT_DRAIN_SECONDS = 0.5  # Pause between closing the listener and closing idle connections
+RESPAWN_BACKOFF_SECONDS = 0.5  # First delay before respawning a worker that failed to start; doubles per failure
+MAX_RESPAWN_BACKOFF_SECONDS = 30
+MAX_START_FAILURES = 5  # Consecutive start failures of one worker before the supervisor gives up
+TCP_MIGRATE_REQ = "/proc/sys/net/ipv4/tcp_migrate_req"
+
+class _WorkerServer(uvicorn.Server):
+    """Uvicorn server that reports back to the supervisor once it is serving."""
+
+    def __init__(self, config: uvicorn.Config, ready):
+        super().__init__(config)
+        self._ready = ready
+
+    async def startup(self, sockets=None):
+        await super().startup(sockets=sockets)
+        if self.started:
+            self._ready.set()
+
+    async def shutdown(self, sockets=None):
+        # Uvicorn closes connections that have not sent a request yet straight away,
+        # which drops clients it accepted just before the listener closed. Stop
+        # accepting first and give those clients a moment to send their request.
+        for server in self.servers:
+            server.close()
+        await asyncio.sleep(ACCEPT_DRAIN_SECONDS)
+        await super().shutdown(sockets=sockets)
+
+def bind_reuse_port_socket(host: str, port: int) -> socket.socket:
+    """Bind a listening socket that other workers can bind to as well."""
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.bind((host, port))
+    sock.set_inheritable(True)
+    return sock
+
+def reuse_port_migrates_connections() -> bool:
+    """Whether the kernel hands a closing SO_REUSEPORT listener's queue to the other listeners."""
+    try:
+        with open(TCP_MIGRATE_REQ) as f:
+            return f.read().strip() == "1"
+    except OSError:
+        return False
+
+def _run_worker(config: uvicorn.Config, sockets: List[socket.socket], ready, reuse_port: bool):
+    """Entry point of a worker process."""
+    config.configure_logging()
+    if reuse_port:
+        sockets = [bind_reuse_port_socket(config.host, config.port)]
+    _WorkerServer(config, ready).run(sockets=sockets)
+
+def _explicit(name: str) -> Optional[int]:
+    """A resource setting the operator set, or None to derive it from the budget."""
+    value = os.environ.get(name)
+    return int(value) if value else None
+
+def invalidation_backend() -> str:
+    """The bus the workers will use: CACHE_INVALIDATION_BACKEND, or a same-host default."""
+    # Workers share a host, so sockets reach them all without a database table
+    return os.environ.get("CACHE_INVALIDATION_BACKEND") or ("unix" if hasattr(socket, "AF_UNIX") else "database")
+
+def background_connections(backend: str) -> int:
+    """Connections each worker opens outside its pool: the email filter scan, and the database bus's own."""
+    return 1 + (backend.lower() == "database")
+
+def resolve_workers(background: int) -> int:
+    """Worker count: WORKERS, or one per CPU core capped to what DB_MAX_CONNECTIONS allows."""
+    if settings.WORKERS > 0:
+        return settings.WORKERS
+    workers = os.cpu_count() or 1
+    # Each worker, plus the spare share for rolling restarts, needs a pooled connection and its background ones
+    affordable = max(1, settings.DB_MAX_CONNECTIONS // (1 + background) - 1)
+    if workers > affordable:
+        logger.warning(
+            "%d CPU cores but DB_MAX_CONNECTIONS=%d only allows %d workers; starting %d",
+            workers, settings.DB_MAX_CONNECTIONS, affordable, affordable,
+        )
+        workers = affordable
+    return workers
+
+def worker_resources(workers: int, background: int) -> Dict[str, int]:
+    """Per-worker settings: an equal share of the shared budgets unless set explicitly."""
+    # One share is held back for the replacement worker during a rolling restart
+    share = max(1, settings.DB_MAX_CONNECTIONS // (workers + 1))
+    pool_size = _explicit("DB_POOL_SIZE") or max(1, share - background)
+    max_overflow = _explicit("DB_MAX_OVERFLOW") or 0  # Never exceed the share
+    # One request per connection, so requests queue at the door instead of in the pool
+    request_limit = _explicit("MAX_CONCURRENT_REQUESTS") or pool_size + max_overflow
+    return {
+        "WORKERS": workers,
+        "DB_POOL_SIZE": pool_size,
+        "DB_MAX_OVERFLOW": max_overflow,
+        "MAX_CONCURRENT_REQUESTS": request_limit,
+        # A thread per admitted request plus one for the periodic session cleanup
+        "THREADPOOL_SIZE": _explicit("THREADPOOL_SIZE") or request_limit + 1,
+        "HASH_CONCURRENCY": _explicit("HASH_CONCURRENCY") or max(1, (os.cpu_count() or 1) // workers),
+    }
+
+def check_resource_budget(resources: Dict[str, int], background: int) -> None:
+    """Make sure the per-worker pools fit the connection budget and requests cannot deadlock on them."""
+    if resources["MAX_CONCURRENT_REQUESTS"] > resources["DB_POOL_SIZE"] + resources["DB_MAX_OVERFLOW"]:
+        raise ValueError(
+            f"MAX_CONCURRENT_REQUESTS={resources['MAX_CONCURRENT_REQUESTS']} is more than the "
+            f"{resources['DB_POOL_SIZE'] + resources['DB_MAX_OVERFLOW']} pooled connections per worker"
+        )
+    if resources["THREADPOOL_SIZE"] <= resources["MAX_CONCURRENT_REQUESTS"]:
+        raise ValueError(
+            f"THREADPOOL_SIZE={resources['THREADPOOL_SIZE']} must be larger than "
+            f"MAX_CONCURRENT_REQUESTS={resources['MAX_CONCURRENT_REQUESTS']}"
+        )
+    workers = resources["WORKERS"]
+    per_worker = resources["DB_POOL_SIZE"] + resources["DB_MAX_OVERFLOW"] + background
+    # The extra worker accounts for the overlap during a rolling restart
+    total = (workers + 1) * per_worker
+    if total > settings.DB_MAX_CONNECTIONS:
+        raise ValueError(
+            f"{workers} workers (+1 during restarts) x {per_worker} connections each "
+            f"needs {total} connections, more than DB_MAX_CONNECTIONS={settings.DB_MAX_CONNECTIONS}"
+        )
+
+class Supervisor:
+    """Spawn, watch and restart uvicorn worker processes."""
+
+    def __init__(self, config: uvicorn.Config, workers: int, reuse_port: bool = False):
+        self.config = config
+        self.workers = workers
+        self.reuse_port = reuse_port
+        self.sockets: List[socket.socket] = []
+        self.processes: list = []
+        self.start_failures: List[int] = []  # Per worker slot, consecutive exits before becoming ready
+        self.respawn_at: List[Optional[float]] = []  # Per worker slot, when a dead worker is due to be respawned
+        self.should_exit = threading.Event()
+        self.restart_requested = threading.Event()
+
+    def spawn_worker(self):
+        """Start one worker process and return (process, ready_event)."""
+        ready = spawn.Event()
+        process = spawn.Process(
+            target=_run_worker,
+            kwargs={
+                "config": self.config,
+                "sockets": self.sockets,
+                "ready": ready,
+                "reuse_port": self.reuse_port,
+            },
+        )
+        process.start()
+        return process, ready
+
+    def stop_worker(self, process) -> None:
+        """Ask a worker to drain and exit, killing it if it overruns the grace period."""
+        if process.is_alive():
+            process.terminate()  # SIGTERM: uvicorn stops accepting and finishes in-flight requests
+        process.join(settings.GRACEFUL_SHUTDOWN_TIMEOUT + 5)
+        if process.is_alive():
+            logger.warning("Worker %s did not stop in time, killing it", process.pid)
+            process.kill()
+            process.join()
+
+    def rolling_restart(self) -> None:
+        """Replace workers one at a time, starting each replacement before stopping the old one."""
+        logger.info("Rolling restart of %d workers", len(self.processes))
+        for index, (old_process, _) in enumerate(list(self.processes)):
+            if self.should_exit.is_set():
+                return
+            new_process, ready = self.spawn_worker()
+            if not ready.wait(WORKER_READY_TIMEOUT):
+                logger.error("Replacement worker %s failed to start, keeping %s", new_process.pid, old_process.pid)
+                self.stop_worker(new_process)
+                continue
+            self.processes[index] = (new_process, ready)
+            self.start_failures[index] = 0
+            self.respawn_at[index] = None
+            self.stop_worker(old_process)
+
+    def replace_dead_workers(self) -> None:
+        """Respawn workers that exited unexpectedly, backing off from ones that fail to start."""
+        now = time.monotonic()
+        for index, (process, ready) in enumerate(self.processes):
+            if process.is_alive():
+                continue
+            if self.respawn_at[index] is None:
+                if ready.is_set():
+                    self.start_failures[index] = 0
+                    delay = 0.0
+                    logger.warning("Worker %s exited with code %s, respawning", process.pid, process.exitcode)
+                else:
+                    # Died before serving: likely a configuration or database problem
+                    self.start_failures[index] += 1
+                    if self.start_failures[index] >= MAX_START_FAILURES:
+                        raise RuntimeError(f"Worker failed to start {MAX_START_FAILURES} times in a row, giving up")
+                    delay = min(RESPAWN_BACKOFF_SECONDS * 2 ** (self.start_failures[index] - 1), MAX_RESPAWN_BACKOFF_SECONDS)
+                    logger.warning(
+                        "Worker %s exited with code %s before it was ready, respawning in %.1fs",
+                        process.pid, process.exitcode, delay,
+                    )
+                self.respawn_at[index] = now + delay
+            if now >= self.respawn_at[index]:
+                self.respawn_at[index] = None
+                self.processes[index] = self.spawn_worker()
+
+    def handle_exit(self, sig, frame) -> None:
+        self.should_exit.set()
+
+    def handle_restart(self, sig, frame) -> None:
+        self.restart_requested.set()
+
+    def run(self) -> None:
+        signal.signal(signal.SIGINT, self.handle_exit)
+        signal.signal(signal.SIGTERM, self.handle_exit)
+        if hasattr(signal, "SIGHUP"):
+            signal.signal(signal.SIGHUP, self.handle_restart)
+
+        if not self.reuse_port:
+            self.sockets = [self.config.bind_socket()]
+
+        logger.info("Starting %d workers (pid %s)", self.workers, os.getpid())
+        self.processes = [self.spawn_worker() for _ in range(self.workers)]
+        self.start_failures = [0] * self.workers
+        self.respawn_at = [None] * self.workers
+
+        try:
+            while not self.should_exit.wait(0.5):
+                if self.restart_requested.is_set():
+                    self.restart_requested.clear()
+                    self.rolling_restart()
+                self.replace_dead_workers()
+        finally:
+            logger.info("Stopping %d workers", len(self.processes))
+            for process, _ in self.processes:
+                if process.is_alive():
+                    process.terminate()
+            for process, _ in self.processes:
+                self.stop_worker(process)
+            for sock in self.sockets:
+                sock.close()
+
+def serve_production(app: str = "app.main:app") -> None:
+    """Run the application with one worker process per core, or WORKERS."""
+    logging.basicConfig(level=logging.INFO)
+    if settings.REUSE_PORT and not hasattr(socket, "SO_REUSEPORT"):
+        raise ValueError("SO_REUSEPORT is not supported on this platform")
+    if settings.REUSE_PORT and not reuse_port_migrates_connections():
+        logger.warning(
+            "REUSE_PORT without net.ipv4.tcp_migrate_req=1: rolling restarts reset connections "
+            "still queued on the old worker's socket; use the shared socket for lossless restarts"
+        )
+    backend = invalidation_backend()
+    background = background_connections(backend)
+    workers = resolve_workers(background)
+    resources = worker_resources(workers, background)
+    check_resource_budget(resources, background)
+
+    # Workers are spawned fresh and read their settings from the environment
+    os.environ.update({name: str(value) for name, value in resources.items()})
+    if workers > 1:
+        os.environ["CACHE_INVALIDATION_BACKEND"] = backend
+
+    config = uvicorn.Config(
+        app,
+        host=settings.HOST,
+        port=settings.PORT,
+        log_level="info",
+        timeout_graceful_shutdown=settings.GRACEFUL_SHUTDOWN_TIMEOUT,
+    )
+    logger.info(
+        "Per-worker resources: db_pool=%d db_overflow=%d requests=%d threadpool=%d hash_concurrency=%d",
+        resources["DB_POOL_SIZE"], resources["DB_MAX_OVERFLOW"], resources["MAX_CONCURRENT_REQUESTS"],
+        resources["THREADPOOL_SIZE"], resources["HASH_CONCURRENCY"],
+    )
+    Supervisor(config, workers, settings.REUSE_PORT).run()
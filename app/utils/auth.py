@@ -1,19 +1,29 @@
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 from jose import JWTError, jwt
+import threading
 from passlib.context import CryptContext
 from ..config import settings
 
 # Password hashing context
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Caps concurrent bcrypt work in this worker so all workers together stay near the core count
+hash_semaphore = threading.BoundedSemaphore(settings.HASH_CONCURRENCY)
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a plain password against its hash."""
-    return pwd_context.verify(plain_password, hashed_password)
+    with hash_semaphore:
+        return pwd_context.verify(plain_password, hashed_password)
+
+def warm_password_hasher() -> None:
+    """Load the bcrypt backend up front so the first login does not pay for it."""
+    pwd_context.handler().get_backend()
 
 def get_password_hash(password: str) -> str:
     """Hash a password."""
-    return pwd_context.hash(password)
+    with hash_semaphore:
+        return pwd_context.hash(password)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token."""
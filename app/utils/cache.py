@@ -0,0 +1,95 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+from ..config import settings
+from .invalidation import invalidation_bus, SESSION_REVOKED, USER_REVOKED
+
+logger = logging.getLogger(__name__)
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire after `ttl` seconds. A ttl of 0 disables it."""
+
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._data: "OrderedDict[str, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.generation = 0  # Bumped on every invalidation
+
+    def get(self, key: str) -> Optional[Any]:
+        if self.ttl <= 0:
+            return None
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, generation: int) -> None:
+        """Store a value loaded while the cache was at `generation`.
+
+        The value is dropped if an invalidation arrived since then, so a
+        revocation can never be overwritten by a stale database read.
+        """
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self.generation += 1
+            self._data.pop(key, None)
+
+    def delete_where(self, predicate: Callable[[Any], bool]) -> None:
+        with self._lock:
+            self.generation += 1
+            for key in [key for key, (_, value) in self._data.items() if predicate(value)]:
+                del self._data[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self.generation += 1
+            self._data.clear()
+
+# Detached User rows keyed by email
+user_cache = TTLCache(settings.AUTH_CACHE_TTL_SECONDS, settings.AUTH_CACHE_MAX_ENTRIES)
+# Detached Session rows keyed by session ID
+session_cache = TTLCache(settings.AUTH_CACHE_TTL_SECONDS, settings.AUTH_CACHE_MAX_ENTRIES)
+
+def handle_invalidation(kind: str, key: str) -> None:
+    """Drop cache entries affected by an invalidation event."""
+    if kind == SESSION_REVOKED:
+        session_cache.delete(key)
+    elif kind == USER_REVOKED:
+        user_cache.delete_where(lambda user: str(user.id) == key)
+        session_cache.delete_where(lambda session: str(session.user_id) == key)
+
+invalidation_bus.subscribe(handle_invalidation)
+
+def _publish(kind: str, key: str) -> None:
+    try:
+        invalidation_bus.publish(kind, key)
+    except Exception:
+        # The local caches are already cleared; other workers catch up through the TTL
+        logger.exception("Failed to publish %s invalidation for %s", kind, key)
+
+def publish_session_revoked(session_id: str) -> None:
+    """Tell every worker that a session was terminated."""
+    _publish(SESSION_REVOKED, session_id)
+
+def publish_user_revoked(user_id: str) -> None:
+    """Tell every worker to drop a user and all of their sessions."""
+    _publish(USER_REVOKED, user_id)
@@ -1,3 +1,4 @@
+from typing import Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
@@ -6,10 +7,27 @@ from ..models.user import User
 from ..models.session import Session as UserSession
 from .auth import verify_token, verify_token_with_session
 from .session import validate_session
+from .cache import user_cache
 
 # Security scheme for JWT
 security = HTTPBearer()
 
+def get_user_by_email(db: Session, email: str) -> Optional[User]:
+    """Get a user by email, served from the in-process cache when possible.
+
+    Returned users are detached from `db` so they can be shared between requests.
+    """
+    user = user_cache.get(email)
+    if user is not None:
+        return user
+
+    generation = user_cache.generation
+    user = db.query(User).filter(User.email == email).first()
+    if user is not None:
+        db.expunge(user)
+        user_cache.set(email, user, generation)
+    return user
+
 def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db)
@@ -26,8 +44,8 @@ def get_current_user(
     if email is None:
         raise credentials_exception
 
-    # Get user from database
-    user = db.query(User).filter(User.email == email).first()
+    # Get user from cache or database
+    user = get_user_by_email(db, email)
     if user is None:
         raise credentials_exception
 
@@ -51,8 +69,8 @@ def get_current_user_with_session(
 
     email, session_id = token_data
 
-    # Get user from database
-    user = db.query(User).filter(User.email == email).first()
+    # Get user from cache or database
+    user = get_user_by_email(db, email)
     if user is None:
         raise credentials_exception
 
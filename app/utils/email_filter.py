@@ -0,0 +1,112 @@
+import hashlib
+import logging
+import math
+import threading
+from typing import Optional
+from sqlalchemy import func, select
+from ..config import settings
+from ..database import create_background_engine, engine
+from ..models.user import User
+from .invalidation import invalidation_bus, EMAIL_REGISTERED
+
+logger = logging.getLogger(__name__)
+
+class BloomFilter:
+    """Set membership with no false negatives and a bounded false-positive rate."""
+
+    def __init__(self, capacity: int, error_rate: float):
+        capacity = max(1, capacity)
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self._lock = threading.Lock()
+
+    def _positions(self, item: str) -> list[int]:
+        # Double hashing: k positions from two 64-bit halves of one digest
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def add(self, item: str) -> None:
+        positions = self._positions(item)
+        # Setting a bit is read-modify-write on a shared byte, so writers must not interleave
+        with self._lock:
+            for position in positions:
+                self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+class EmailFilter:
+    """Bloom filter of registered emails, kept current across workers through the invalidation bus."""
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self._filter = BloomFilter(capacity, error_rate)
+        self.ready = False
+
+    def add(self, email: str) -> None:
+        self._filter.add(email)
+
+    def might_contain(self, email: str) -> bool:
+        """False means the email is definitely not registered. Always True until the filter is built."""
+        return not self.ready or email in self._filter
+
+    def build(self, batch_size: int = 10000, stop_event: Optional[threading.Event] = None) -> int:
+        """Load every registered email with a streamed scan of users.email.
+
+        The scan runs on its own connection so requests never queue behind it,
+        and stops between batches once `stop_event` is set, leaving the filter
+        not ready.
+        """
+        background_engine = create_background_engine()
+        loaded = 0
+        try:
+            with background_engine.connect() as conn:
+                count = conn.execute(select(func.count(User.id))).scalar() or 0
+                # Leave room to grow; emails registered during the scan arrive through add()
+                if count * 2 > self.capacity:
+                    self.capacity = count * 2
+                    self._filter = BloomFilter(self.capacity, self.error_rate)
+
+                result = conn.execution_options(yield_per=batch_size).execute(select(User.email))
+                for batch in result.partitions():
+                    if stop_event is not None and stop_event.is_set():
+                        logger.info("Email filter build stopped after %d emails", loaded)
+                        return loaded
+                    for (email,) in batch:
+                        self._filter.add(email)
+                    loaded += len(batch)
+        finally:
+            if background_engine is not engine:
+                background_engine.dispose()
+
+        self.ready = True
+        logger.info("Email filter built with %d emails (%d bits, %d hashes)", loaded, self._filter.size, self._filter.hash_count)
+        return loaded
+
+email_filter = EmailFilter(settings.EMAIL_FILTER_CAPACITY, settings.EMAIL_FILTER_ERROR_RATE)
+
+def build_email_filter(stop_event: Optional[threading.Event] = None) -> None:
+    """Build the email filter, logging instead of raising so startup is never blocked."""
+    try:
+        email_filter.build(stop_event=stop_event)
+    except Exception:
+        logger.exception("Building the email filter failed; email checks will use the database")
+
+def handle_email_registered(kind: str, key: str) -> None:
+    if kind == EMAIL_REGISTERED:
+        email_filter.add(key)
+
+invalidation_bus.subscribe(handle_email_registered)
+
+def publish_email_registered(email: str) -> None:
+    """Add a new email to every worker's filter."""
+    try:
+        invalidation_bus.publish(EMAIL_REGISTERED, email)
+    except Exception:
+        # This worker's filter already has it; other workers miss it until they rebuild,
+        # and registration still hits the unique index
+        logger.exception("Failed to publish registration of %s", email)
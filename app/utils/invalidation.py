@@ -0,0 +1,263 @@
+"""
+Cross-worker cache invalidation bus.
+
+Every worker keeps its own in-process caches. When one worker revokes a
+session or user it publishes an event on the bus, and every worker
+(including the publisher) passes it to its subscribers, which drop the
+affected cache entries. Newly registered emails are broadcast the same
+way so every worker's email filter stays complete.
+
+Backends:
+- memory: in-process only, for a single worker
+- unix: datagram broadcast over Unix sockets in a shared directory; near-instant, same host only
+- database: change-log table polled every CACHE_INVALIDATION_POLL_MS; works wherever the database is shared
+
+If a backend cannot start (e.g. the cache_invalidations table is missing)
+the worker logs an error and keeps delivering events in-process only; other
+workers then see revocations only when their cache entries expire.
+
+Another transport (e.g. Redis pub/sub) only needs to subclass
+InvalidationBus and implement _send(), _start() and stop().
+"""
+
+import glob
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List
+from sqlalchemy import delete, func, insert, or_, select
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[str, str], None]
+
+# Event kinds
+SESSION_REVOKED = "session"
+USER_REVOKED = "user"
+EMAIL_REGISTERED = "email"
+
+class InvalidationBus:
+    """Interface for broadcasting (kind, key) invalidation events to every worker."""
+
+    def __init__(self):
+        self._handlers: List[Handler] = []
+        self.local_only = False  # Set when the transport failed to start
+
+    def subscribe(self, handler: Handler) -> None:
+        """Register a handler called with (kind, key) for every event."""
+        self._handlers.append(handler)
+
+    def publish(self, kind: str, key: str) -> None:
+        """Broadcast an event. Handlers in this worker run before publish returns."""
+        self._dispatch(kind, key)
+        if not self.local_only:
+            self._send(kind, key)
+
+    def start(self) -> None:
+        """Start receiving events from other workers, falling back to in-process delivery on failure."""
+        try:
+            self._start()
+        except Exception as e:
+            self.local_only = True
+            logger.error(
+                "Cache invalidation backend %s failed to start (%s); delivering events in this worker only",
+                type(self).__name__, e,
+            )
+
+    def stop(self) -> None:
+        """Stop receiving events and release resources."""
+
+    def _send(self, kind: str, key: str) -> None:
+        """Deliver an event to the other workers."""
+
+    def _start(self) -> None:
+        """Open the transport and start receiving events."""
+
+    def _dispatch(self, kind: str, key: str) -> None:
+        for handler in self._handlers:
+            try:
+                handler(kind, key)
+            except Exception:
+                logger.exception("Invalidation handler failed for %s:%s", kind, key)
+
+class MemoryInvalidationBus(InvalidationBus):
+    """Delivers events within this process only."""
+
+class UnixSocketInvalidationBus(InvalidationBus):
+    """Broadcasts events as datagrams to every worker socket in a shared directory."""
+
+    def __init__(self, directory: str):
+        super().__init__()
+        self.directory = directory
+        self.path = os.path.join(directory, f"{os.getpid()}.sock")
+        self._sock = None
+        self._thread = None
+        self._stopping = threading.Event()
+
+    def _send(self, kind: str, key: str) -> None:
+        message = f"{kind}:{key}".encode()
+        with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as sender:
+            for path in glob.glob(os.path.join(self.directory, "*.sock")):
+                if path == self.path:
+                    continue
+                try:
+                    sender.sendto(message, path)
+                except (ConnectionRefusedError, FileNotFoundError):
+                    # Left behind by a worker that exited without cleaning up
+                    try:
+                        os.unlink(path)
+                    except FileNotFoundError:
+                        pass
+                except OSError:
+                    logger.exception("Failed to send invalidation to %s", path)
+
+    def _start(self) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._sock.bind(self.path)
+        self._sock.settimeout(0.5)
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._listen, name="invalidation-bus", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopping.set()
+        if self._thread:
+            self._thread.join()
+        if self._sock:
+            self._sock.close()
+            try:
+                os.unlink(self.path)
+            except FileNotFoundError:
+                pass
+
+    def _listen(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                data = self._sock.recv(1024)
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            kind, _, key = data.decode().partition(":")
+            self._dispatch(kind, key)
+
+class DatabaseInvalidationBus(InvalidationBus):
+    """Appends events to the cache_invalidations table; workers poll for new rows.
+
+    Concurrent publishers can commit out of id order, so a row may appear
+    below ids already seen. Ids skipped by the cursor are remembered as gaps
+    and polled for until they show up or GAP_TIMEOUT passes (the insert was
+    rolled back or its id was never used).
+    """
+
+    RETENTION = timedelta(minutes=10)
+    PRUNE_EVERY = 300  # Polls between deletions of old rows
+    GAP_TIMEOUT = 60.0  # Seconds to wait for a skipped id; far longer than any publish transaction
+    MAX_GAPS = 1000
+
+    def __init__(self, engine, poll_interval: float):
+        super().__init__()
+        from ..models.cache_invalidation import CacheInvalidation
+        self.engine = engine
+        self.table = CacheInvalidation.__table__
+        self.poll_interval = poll_interval
+        self.origin = str(uuid.uuid4())
+        self._last_id = 0
+        self._gaps: Dict[int, float] = {}  # Skipped id -> monotonic time it was first missed
+        self._thread = None
+        self._stopping = threading.Event()
+
+    def _send(self, kind: str, key: str) -> None:
+        with self.engine.begin() as conn:
+            conn.execute(insert(self.table).values(kind=kind, key=key, origin=self.origin))
+
+    def _start(self) -> None:
+        with self.engine.connect() as conn:
+            self._last_id = conn.execute(select(func.max(self.table.c.id))).scalar() or 0
+        self._gaps.clear()
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._poll_loop, name="invalidation-bus", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopping.set()
+        if self._thread:
+            self._thread.join()
+        self.engine.dispose()
+
+    def poll(self) -> int:
+        """Dispatch events published by other workers since the last poll."""
+        table = self.table
+        now = time.monotonic()
+        for gap in [gap for gap, since in self._gaps.items() if now - since > self.GAP_TIMEOUT]:
+            del self._gaps[gap]
+
+        condition = table.c.id > self._last_id
+        if self._gaps:
+            condition = or_(condition, table.c.id.in_(list(self._gaps)))
+        with self.engine.connect() as conn:
+            rows = conn.execute(
+                select(table.c.id, table.c.kind, table.c.key, table.c.origin)
+                .where(condition)
+                .order_by(table.c.id)
+            ).all()
+
+        for row in rows:
+            if row.id > self._last_id:
+                self._remember_gaps(row.id, now)
+                self._last_id = row.id
+            else:
+                self._gaps.pop(row.id, None)
+            if row.origin != self.origin:
+                self._dispatch(row.kind, row.key)
+        return len(rows)
+
+    def _remember_gaps(self, next_id: int, now: float) -> None:
+        """Record the ids between the cursor and `next_id`, which may still commit."""
+        first = max(self._last_id + 1, next_id - self.MAX_GAPS)
+        for gap in range(first, next_id):
+            self._gaps[gap] = now
+        while len(self._gaps) > self.MAX_GAPS:
+            # Oldest ids first: they are the least likely to still commit
+            del self._gaps[min(self._gaps)]
+
+    def prune(self) -> None:
+        """Delete events every worker has long since seen."""
+        # Timezone-naive UTC, matching how SQLite stores CURRENT_TIMESTAMP
+        cutoff = (datetime.now(timezone.utc) - self.RETENTION).replace(tzinfo=None)
+        with self.engine.begin() as conn:
+            conn.execute(delete(self.table).where(self.table.c.created_at < cutoff))
+
+    def _poll_loop(self) -> None:
+        polls = 0
+        while not self._stopping.wait(self.poll_interval):
+            try:
+                self.poll()
+                polls += 1
+                if polls % self.PRUNE_EVERY == 0:
+                    self.prune()
+            except Exception:
+                logger.exception("Polling cache invalidations failed")
+
+def create_invalidation_bus() -> InvalidationBus:
+    """Build the bus selected by CACHE_INVALIDATION_BACKEND."""
+    backend = settings.CACHE_INVALIDATION_BACKEND.lower()
+    if backend == "memory":
+        return MemoryInvalidationBus()
+    if backend == "unix":
+        return UnixSocketInvalidationBus(settings.CACHE_INVALIDATION_SOCKET_DIR)
+    if backend == "database":
+        from ..database import create_background_engine
+        # Its own connection, so polling never competes with requests for the pool
+        return DatabaseInvalidationBus(create_background_engine(pool_size=1), settings.CACHE_INVALIDATION_POLL_MS / 1000)
+    raise ValueError(f"Unknown CACHE_INVALIDATION_BACKEND: {settings.CACHE_INVALIDATION_BACKEND}")
+
+invalidation_bus = create_invalidation_bus()
@@ -0,0 +1,29 @@
+import asyncio
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+class ConcurrencyLimitMiddleware:
+    """Admit at most `limit` HTTP requests into the app at once; the rest wait their turn.
+
+    A request keeps its database connection from the first query until its
+    get_db dependency exits, but hops between threadpool threads meanwhile.
+    If more requests run than there are connections, threads block in the
+    pool waiting for connections whose requests are waiting for a thread.
+    Admitting no more requests than the pool holds means a request never
+    waits for a connection, so the threadpool only needs one spare thread
+    for background work.
+    """
+
+    def __init__(self, app: ASGIApp, limit: int):
+        self.app = app
+        self.limit = limit
+        self._semaphore = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or self.limit <= 0:
+            await self.app(scope, receive, send)
+            return
+        if self._semaphore is None:
+            # Created on first use so it belongs to the server's event loop
+            self._semaphore = asyncio.Semaphore(self.limit)
+        async with self._semaphore:
+            await self.app(scope, receive, send)
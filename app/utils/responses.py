@@ -0,0 +1,71 @@
+from typing import Any, Dict
+from fastapi import Request, Response, status
+from fastapi.responses import ORJSONResponse
+import hashlib
+from ..models.session import Session
+from ..models.user import User
+
+def user_to_dict(user: User) -> Dict[str, Any]:
+    """Convert database user to a plain dict matching UserResponse.
+
+    Values come straight from the database, so they are not re-validated.
+    UUIDs and datetimes are left to orjson, which renders them natively in
+    the same format as str() and isoformat().
+    """
+    return {
+        "id": user.id,
+        "email": user.email,
+        "name": user.name,
+        "createdAt": user.created_at,
+    }
+
+def session_to_dict(session: Session) -> Dict[str, Any]:
+    """Convert database session to a plain dict matching SessionResponse."""
+    return {
+        "session_id": session.session_id,
+        "user_id": session.user_id,
+        "expires_at": session.expires_at,
+        "device_info": session.device_info,
+        "created_at": session.created_at,
+        "last_accessed_at": session.last_accessed_at,
+    }
+
+def session_list_to_dict(sessions: list[Session]) -> Dict[str, Any]:
+    """Convert database sessions to a plain dict matching SessionListResponse."""
+    items = [session_to_dict(session) for session in sessions]
+    return {"sessions": items, "total": len(items)}
+
+def fast_json_response(content: Dict[str, Any], status_code: int = 200, **kwargs) -> ORJSONResponse:
+    """Serialize pre-validated content with orjson.
+
+    Returning a Response instance makes FastAPI skip response_model
+    validation and serialization; the response_model on the route is
+    still used for the OpenAPI schema.
+    """
+    return ORJSONResponse(content=content, status_code=status_code, **kwargs)
+
+def compute_etag(*parts: Any) -> str:
+    """Build a strong ETag from the values a response is derived from."""
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest()
+    return f'"{digest}"'
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Check the request's If-None-Match header against `etag`."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison, so ignore any W/ prefix
+    candidates = (tag.strip().removeprefix("W/") for tag in header.split(","))
+    return etag in candidates
+
+def conditional_json_response(request: Request, etag: str, build_content) -> Response:
+    """Return 304 if the client already has `etag`, otherwise build and send the content.
+
+    `build_content` is only called when the client's copy is stale.
+    """
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return fast_json_response(build_content(), headers=headers)
@@ -1,9 +1,11 @@
 from datetime import datetime, timedelta, timezone
 from typing import Optional, Dict, Any
+from sqlalchemy import func
 from sqlalchemy.orm import Session as DBSession
 from ..models.session import Session
 from ..models.user import User
 from ..config import settings
+from .cache import session_cache, publish_session_revoked, publish_user_revoked
 import uuid
 import json
 
@@ -44,7 +46,26 @@ def get_session_by_id(db: DBSession, session_id: str) -> Optional[Session]:
         return None
 
 def validate_session(db: DBSession, session_id: str) -> Optional[Session]:
-    """Validate a session and return it if valid."""
+    """Validate a session and return it if valid.
+
+    Valid sessions are cached (detached from `db`). A cache hit still touches
+    the row to record the access, and a missing row means the session was
+    terminated elsewhere, so revocation takes effect immediately.
+    """
+    cached = session_cache.get(session_id)
+    if cached is not None and not cached.is_expired():
+        now = datetime.now(timezone.utc)
+        updated = db.query(Session).filter(
+            Session.session_id == cached.session_id
+        ).update({Session.last_accessed_at: now}, synchronize_session=False)
+        db.commit()
+        if not updated:
+            session_cache.delete(session_id)
+            return None
+        cached.last_accessed_at = now
+        return cached
+
+    generation = session_cache.generation
     session = get_session_by_id(db, session_id)
     
     if not session:
@@ -52,6 +73,7 @@ def validate_session(db: DBSession, session_id: str) -> Optional[Session]:
     
     if session.is_expired():
         # Clean up expired session
+        session_cache.delete(session_id)
         db.delete(session)
         db.commit()
         return None
@@ -59,6 +81,10 @@ def validate_session(db: DBSession, session_id: str) -> Optional[Session]:
     # Update last accessed time
     session.update_last_accessed()
     db.commit()
+
+    db.refresh(session)
+    db.expunge(session)
+    session_cache.set(str(session.session_id), session, generation)
     
     return session
 
@@ -73,8 +99,10 @@ def terminate_session(db: DBSession, session_id: str, user_id: Optional[str] = N
     if user_id and str(session.user_id) != user_id:
         return False
     
+    terminated_id = str(session.session_id)
     db.delete(session)
     db.commit()
+    publish_session_revoked(terminated_id)
     return True
 
 def get_user_sessions(db: DBSession, user_id: str, include_expired: bool = False) -> list[Session]:
@@ -92,6 +120,28 @@ def get_user_sessions(db: DBSession, user_id: str, include_expired: bool = False
     except ValueError:
         return []
 
+def get_user_sessions_version(db: DBSession, user_id: str) -> tuple:
+    """Summarize a user's active sessions without loading them.
+
+    The result changes whenever the list returned by get_user_sessions
+    (include_expired=False) changes: sessions are created with a newer
+    created_at, removed or expired sessions lower the count, and accesses
+    move last_accessed_at.
+    """
+    try:
+        user_uuid = uuid.UUID(user_id)
+    except ValueError:
+        return (0, None, None)
+
+    # Use timezone-naive datetime for SQLite compatibility
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    count, latest_created, latest_accessed = db.query(
+        func.count(Session.session_id),
+        func.max(Session.created_at),
+        func.max(Session.last_accessed_at)
+    ).filter(Session.user_id == user_uuid, Session.expires_at > now).one()
+    return (count, latest_created, latest_accessed)
+
 def cleanup_expired_sessions(db: DBSession) -> int:
     """Clean up all expired sessions and return the count of cleaned sessions."""
     # Use timezone-naive datetime for SQLite compatibility
@@ -125,6 +175,7 @@ def terminate_all_user_sessions(db: DBSession, user_id: str, except_session_id:
             db.delete(session)
         
         db.commit()
+        publish_user_revoked(str(user_uuid))
         return count
     except ValueError:
         return 0
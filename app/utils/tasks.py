@@ -0,0 +1,34 @@
+import asyncio
+import logging
+from starlette.concurrency import run_in_threadpool
+from ..database import SessionLocal
+from .session import cleanup_expired_sessions
+
+logger = logging.getLogger(__name__)
+
+def _cleanup_once() -> int:
+    """Run one expired-session cleanup in its own database session."""
+    db = SessionLocal()
+    try:
+        return cleanup_expired_sessions(db)
+    finally:
+        db.close()
+
+async def periodic_session_cleanup(stop_event: asyncio.Event, interval_seconds: float):
+    """Clean up expired sessions every `interval_seconds` until `stop_event` is set.
+
+    A cleanup that is already running is allowed to finish before the task
+    returns, so shutdown never interrupts a half-done delete.
+    """
+    while not stop_event.is_set():
+        try:
+            await asyncio.wait_for(stop_event.wait(), timeout=interval_seconds)
+            break
+        except asyncio.TimeoutError:
+            pass
+
+        try:
+            count = await run_in_threadpool(_cleanup_once)
+            logger.info("Cleaned up %d expired sessions", count)
+        except Exception:
+            logger.exception("Expired session cleanup failed")
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Data-size scaling benchmark for the session and auth helpers.
+
+For each scale a synthetic dataset is generated (see generate_dataset.py),
+then every helper in app/utils/session.py and app/utils/dependencies.py is
+timed against it in a fresh process. Caches are disabled so each call hits
+the database. Results are printed as a comparison table and can be saved
+as JSON.
+
+Helpers that delete data (terminate_session, terminate_all_user_sessions,
+cleanup_expired_sessions) run after the read-only ones, each call on
+different rows; cleanup_expired_sessions runs once.
+
+Usage:
+    python benchmarks/bench_scaling.py                      # 10k and 1m
+    python benchmarks/bench_scaling.py --scales 10k,1m,10m --repeat 20 --output scaling.json
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+def _timed(func, repeat: int, arguments=None) -> dict:
+    """Run func `repeat` times (with arguments[i] if given) and summarize in milliseconds."""
+    samples = []
+    for i in range(repeat):
+        args = arguments[i] if arguments is not None else ()
+        start = time.perf_counter()
+        func(*args)
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        "median_ms": statistics.median(samples),
+        "p95_ms": samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+        "calls": len(samples),
+    }
+
+def run_child(repeat: int, seed: int) -> dict:
+    """Time every helper against the database in DATABASE_URL."""
+    from datetime import datetime, timezone
+    from fastapi.security import HTTPAuthorizationCredentials
+    from sqlalchemy import func, select
+    from app.database import SessionLocal
+    from app.models import User, Session
+    from app.utils.auth import create_access_token, create_access_token_with_session
+    from app.utils import session as session_utils
+    from app.utils import dependencies
+    from generate_dataset import user_email
+
+    rng = random.Random(seed)
+    db = SessionLocal()
+
+    # Pick inputs up front; none of this is timed
+    user_count = db.execute(select(func.count(User.id))).scalar()
+    typical_emails = [user_email(rng.randrange(user_count)) for _ in range(repeat)]
+    typical_users = [db.query(User).filter(User.email == email).one() for email in typical_emails]
+    heavy_user_ids = [str(user_id) for user_id, _ in db.execute(
+        select(Session.user_id, func.count()).group_by(Session.user_id).order_by(func.count().desc()).limit(repeat * 2)
+    ).all()]
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    active_ids = [str(session_id) for (session_id,) in db.execute(
+        select(Session.session_id).where(Session.expires_at > now).limit(repeat * 2)
+    ).all()]
+    # Validation targets and termination targets must not overlap
+    validate_ids, terminate_ids = active_ids[:repeat], active_ids[repeat:]
+
+    def session_token(session_id: str) -> HTTPAuthorizationCredentials:
+        owner_email = db.execute(
+            select(User.email).join(Session, Session.user_id == User.id)
+            .where(Session.session_id == uuid.UUID(session_id))
+        ).scalar_one()
+        token = create_access_token_with_session({"sub": owner_email}, session_id)
+        return HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+    user_tokens = [
+        (HTTPAuthorizationCredentials(scheme="Bearer", credentials=create_access_token({"sub": email})),)
+        for email in typical_emails
+    ]
+    session_tokens = [(session_token(session_id),) for session_id in validate_ids]
+    db.close()
+
+    def with_db(helper):
+        def call(*args):
+            db = SessionLocal()
+            try:
+                helper(db, *args)
+            finally:
+                db.close()
+        return call
+
+    def with_db_last(helper):
+        # Dependencies take the database session as their last argument
+        def call(*args):
+            db = SessionLocal()
+            try:
+                helper(*args, db)
+            finally:
+                db.close()
+        return call
+
+    results = {}
+    results["session.create_session"] = _timed(with_db(session_utils.create_session), repeat, [(user,) for user in typical_users])
+    results["session.get_session_by_id"] = _timed(with_db(session_utils.get_session_by_id), repeat, [(sid,) for sid in validate_ids])
+    results["session.validate_session"] = _timed(with_db(session_utils.validate_session), repeat, [(sid,) for sid in validate_ids])
+    results["session.get_user_sessions (typical user)"] = _timed(
+        with_db(session_utils.get_user_sessions), repeat, [(str(user.id),) for user in typical_users])
+    results["session.get_user_sessions (heaviest users)"] = _timed(
+        with_db(session_utils.get_user_sessions), repeat, [(uid,) for uid in heavy_user_ids[:repeat]])
+    results["session.get_user_sessions_version (heaviest users)"] = _timed(
+        with_db(session_utils.get_user_sessions_version), repeat, [(uid,) for uid in heavy_user_ids[:repeat]])
+    results["session.extract_device_info"] = _timed(
+        session_utils.extract_device_info, repeat, [("Mozilla/5.0", "127.0.0.1")] * repeat)
+    results["dependencies.get_user_by_email"] = _timed(
+        with_db(dependencies.get_user_by_email), repeat, [(email,) for email in typical_emails])
+    results["dependencies.get_current_user"] = _timed(with_db_last(dependencies.get_current_user), repeat, user_tokens)
+    results["dependencies.get_current_user_with_session"] = _timed(
+        with_db_last(dependencies.get_current_user_with_session), repeat, session_tokens)
+
+    # Destructive helpers last, each call on rows nothing else uses
+    results["session.terminate_session"] = _timed(
+        with_db(session_utils.terminate_session), len(terminate_ids), [(sid,) for sid in terminate_ids])
+    results["session.terminate_all_user_sessions (heavy users)"] = _timed(
+        with_db(session_utils.terminate_all_user_sessions), repeat, [(uid,) for uid in heavy_user_ids[repeat:]])
+    results["session.cleanup_expired_sessions"] = _timed(with_db(session_utils.cleanup_expired_sessions), 1)
+    return results
+
+def run_scale(scale: str, data_dir: str, repeat: int, seed: int, reuse: bool) -> dict:
+    """Generate (or reuse) the dataset for a scale and time it in a child process."""
+    from generate_dataset import SCALES, generate
+
+    path = os.path.join(data_dir, f"bench_{scale}.db")
+    database_url = f"sqlite:///{path}"
+    if not (reuse and os.path.exists(path)):
+        if os.path.exists(path):
+            os.remove(path)
+        users, sessions = SCALES[scale]
+        generated = generate(database_url, users, sessions, seed=seed)
+        print(f"[{scale}] generated {generated['users']} users / {generated['sessions']} sessions "
+              f"in {generated['seconds']:.1f}s", file=sys.stderr)
+
+    env = dict(
+        os.environ,
+        DATABASE_URL=database_url,
+        AUTH_CACHE_TTL_SECONDS="0",
+        CACHE_INVALIDATION_BACKEND="memory",
+    )
+    result = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", "--repeat", str(repeat), "--seed", str(seed)],
+        cwd=PROJECT_ROOT, env=env, capture_output=True, text=True, check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def print_report(results: dict) -> None:
+    scales = list(results)
+    helpers = list(results[scales[0]])
+    width = max(len(helper) for helper in helpers)
+    header = f"{'helper (median ms)':<{width}} " + " ".join(f"{scale:>10}" for scale in scales)
+    if len(scales) > 1:
+        header += f" {scales[-1] + '/' + scales[0]:>10}"
+    print(header)
+    print("-" * len(header))
+    for helper in helpers:
+        medians = [results[scale][helper]["median_ms"] for scale in scales]
+        line = f"{helper:<{width}} " + " ".join(f"{median:>10.3f}" for median in medians)
+        if len(scales) > 1:
+            line += f" {medians[-1] / medians[0]:>9.1f}x" if medians[0] else f" {'-':>10}"
+        print(line)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", default="10k,1m", help="Comma-separated presets from generate_dataset.SCALES")
+    parser.add_argument("--repeat", type=int, default=10, help="Calls per helper")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--data-dir", help="Where to keep generated databases (default: a temporary directory)")
+    parser.add_argument("--reuse", action="store_true", help="Reuse databases already in --data-dir (they are modified by each run)")
+    parser.add_argument("--output", help="Also write the results as JSON to this file")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    if args.child:
+        print(json.dumps(run_child(args.repeat, args.seed)))
+        return
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmpdir:
+        data_dir = args.data_dir or tmpdir
+        os.makedirs(data_dir, exist_ok=True)
+        for scale in args.scales.split(","):
+            results[scale] = run_scale(scale.strip(), data_dir, args.repeat, args.seed, args.reuse)
+
+    print_report(results)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == "__main__":
+    main()
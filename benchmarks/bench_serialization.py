@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Serialization benchmark for session list responses.
+
+Compares the response_model path (one SessionResponse per row, then FastAPI
+validation and JSON encoding) against the pre-validated orjson path used by
+GET /sessions/.
+
+Usage:
+    python benchmarks/bench_serialization.py [--repeat N]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from app.models.session import Session
+from app.routes.session import convert_session_to_response
+from app.schemas.session import SessionListResponse
+from app.utils.responses import session_list_to_dict, fast_json_response
+
+SIZES = [1, 100, 10_000]
+
+def build_sessions(count: int) -> list[Session]:
+    """Build detached session rows shaped like real database rows."""
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    user_id = uuid.uuid4()
+    return [
+        Session(
+            session_id=uuid.uuid4(),
+            user_id=user_id,
+            expires_at=now + timedelta(days=7),
+            device_info='{"user_agent": "Mozilla/5.0", "ip_address": "127.0.0.1"}',
+            created_at=now,
+            last_accessed_at=now if i % 2 else None,
+        )
+        for i in range(count)
+    ]
+
+def response_model_path(sessions: list[Session], field, loop) -> bytes:
+    """Previous path: build pydantic models, then let FastAPI validate and encode."""
+    session_responses = [convert_session_to_response(session) for session in sessions]
+    content = SessionListResponse(sessions=session_responses, total=len(session_responses))
+    encoded = loop.run_until_complete(
+        serialize_response(field=field, response_content=content, is_coroutine=False)
+    )
+    return JSONResponse(content=encoded).body
+
+def fast_path(sessions: list[Session]) -> bytes:
+    """Current path: plain dicts rendered directly by orjson."""
+    return fast_json_response(session_list_to_dict(sessions)).body
+
+def timeit(func, repeat: int) -> float:
+    """Return the best time per call in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement (best is reported)")
+    args = parser.parse_args()
+
+    field = create_response_field(name="Response_get_active_sessions", type_=SessionListResponse)
+    loop = asyncio.new_event_loop()
+
+    print(f"{'sessions':>10} {'response_model (ms)':>20} {'orjson (ms)':>12} {'speedup':>8}")
+    for size in SIZES:
+        sessions = build_sessions(size)
+        assert response_model_path(sessions, field, loop) == fast_path(sessions), "payload mismatch"
+        slow = timeit(lambda: response_model_path(sessions, field, loop), args.repeat)
+        fast = timeit(lambda: fast_path(sessions), args.repeat)
+        print(f"{size:>10} {slow:>20.3f} {fast:>12.3f} {slow / fast:>7.1f}x")
+
+    loop.close()
+
+if __name__ == "__main__":
+    main()
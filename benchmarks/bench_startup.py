@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Startup-time benchmark.
+
+Measures, in a fresh interpreter per run, how long it takes to import
+app.main, to run the lifespan startup (schema check and warm-up) and to
+serve the first request. Runs against a throwaway SQLite database.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs N]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Executed in a child process so every run starts from a cold interpreter
+CHILD_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+from app.main import app
+imported = time.perf_counter()
+
+from fastapi.testclient import TestClient
+client = TestClient(app)
+lifespan_start = time.perf_counter()
+client.__enter__()
+started = time.perf_counter()
+response = client.get("/health")
+first_request = time.perf_counter()
+assert response.status_code == 200
+client.__exit__(None, None, None)
+
+print(json.dumps({
+    "import_ms": (imported - start) * 1000,
+    "lifespan_ms": (started - lifespan_start) * 1000,
+    "first_request_ms": (first_request - started) * 1000,
+}))
+"""
+
+def run_once(env: dict) -> dict:
+    """Run the child script once and return its timings."""
+    result = subprocess.run(
+        [sys.executable, "-c", CHILD_SCRIPT],
+        cwd=PROJECT_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="Cold starts per configuration (median is reported)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        base_env = dict(os.environ)
+        base_env["DATABASE_URL"] = f"sqlite:///{os.path.join(tmpdir, 'startup.db')}"
+        base_env["SESSION_CLEANUP_INTERVAL_HOURS"] = "0"
+
+        configurations = [
+            ("schema check", {"SCHEMA_CHECK_ON_STARTUP": "True"}),
+            ("no schema check", {"SCHEMA_CHECK_ON_STARTUP": "False"}),
+        ]
+
+        # Create the schema once so the "no schema check" runs have tables
+        run_once({**base_env, "SCHEMA_CHECK_ON_STARTUP": "True"})
+
+        print(f"{'configuration':<18} {'import (ms)':>12} {'lifespan (ms)':>14} {'first request (ms)':>19}")
+        for name, overrides in configurations:
+            runs = [run_once({**base_env, **overrides}) for _ in range(args.runs)]
+            medians = {key: statistics.median(run[key] for run in runs) for key in runs[0]}
+            print(
+                f"{name:<18} {medians['import_ms']:>12.1f} "
+                f"{medians['lifespan_ms']:>14.1f} {medians['first_request_ms']:>19.1f}"
+            )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Synthetic dataset generator.
+
+Fills the users and sessions tables with realistic-looking data through the
+application's models, using bulk inserts. Every user gets the same password
+hash (of DEFAULT_PASSWORD), so no bcrypt work is done per row.
+
+Sessions per user follow a Pareto distribution (--skew; 0 gives every user
+the same number), and --expired-fraction of sessions are already expired.
+
+Usage:
+    python benchmarks/generate_dataset.py --scale 1m --database-url sqlite:///./bench_1m.db
+    python benchmarks/generate_dataset.py --users 5000 --sessions 80000 --skew 1.5
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, event, insert
+from app.database import Base
+from app.models import User, Session
+from app.utils.auth import get_password_hash
+
+DEFAULT_PASSWORD = "Benchmark1!"
+
+# Preset sizes: total session rows, with ten sessions per user on average
+SCALES = {
+    "10k": (1_000, 10_000),
+    "1m": (100_000, 1_000_000),
+    "10m": (1_000_000, 10_000_000),
+}
+
+def user_email(index: int) -> str:
+    """Email of the generated user with the given index."""
+    return f"user{index}@example.com"
+
+def sessions_per_user(users: int, sessions: int, skew: float, rng: random.Random) -> list[int]:
+    """Split `sessions` across `users`, heavy-tailed when skew > 0."""
+    if skew <= 0:
+        weights = [1.0] * users
+    else:
+        weights = [rng.paretovariate(skew) for _ in range(users)]
+    scale = sessions / sum(weights)
+    return [int(weight * scale + rng.random()) for weight in weights]
+
+def _sqlite_bulk_pragmas(dbapi_connection, connection_record):
+    # Generated data is disposable, so trade durability for load speed
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=OFF")
+    cursor.execute("PRAGMA synchronous=OFF")
+    cursor.close()
+
+def generate(database_url: str, users: int, sessions: int, skew: float = 1.2,
+             expired_fraction: float = 0.2, batch_size: int = 10_000, seed: int = 42) -> dict:
+    """Create the schema and insert the dataset. Returns row counts and timing."""
+    rng = random.Random(seed)
+    engine = create_engine(database_url)
+    if engine.dialect.name == "sqlite":
+        event.listen(engine, "connect", _sqlite_bulk_pragmas)
+    Base.metadata.create_all(bind=engine)
+
+    hashed_password = get_password_hash(DEFAULT_PASSWORD)
+    # Timezone-naive UTC, as the application stores it for SQLite
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    user_table = User.__table__
+    session_table = Session.__table__
+    counts = sessions_per_user(users, sessions, skew, rng)
+
+    start = time.perf_counter()
+    inserted_sessions = 0
+    with engine.begin() as conn:
+        user_rows, session_rows = [], []
+        for index, session_count in enumerate(counts):
+            user_id = uuid.uuid4()
+            user_rows.append({
+                "id": user_id,
+                "email": user_email(index),
+                "name": f"User {index}",
+                "hashed_password": hashed_password,
+                "created_at": now - timedelta(days=rng.randint(1, 365)),
+            })
+            for _ in range(session_count):
+                created_at = now - timedelta(seconds=rng.randint(0, 14 * 24 * 3600))
+                if rng.random() < expired_fraction:
+                    expires_at = now - timedelta(seconds=rng.randint(1, 7 * 24 * 3600))
+                else:
+                    expires_at = now + timedelta(seconds=rng.randint(1, 7 * 24 * 3600))
+                session_rows.append({
+                    "session_id": uuid.uuid4(),
+                    "user_id": user_id,
+                    "expires_at": expires_at,
+                    "device_info": '{"user_agent": "Mozilla/5.0", "ip_address": "10.0.0.%d"}' % rng.randint(1, 254),
+                    "created_at": created_at,
+                    "last_accessed_at": created_at + timedelta(minutes=rng.randint(1, 600)) if rng.random() < 0.7 else None,
+                })
+
+            # Sessions reference their users, so pending users go in first
+            if user_rows and (len(user_rows) >= batch_size or len(session_rows) >= batch_size):
+                conn.execute(insert(user_table), user_rows)
+                user_rows = []
+            if len(session_rows) >= batch_size:
+                conn.execute(insert(session_table), session_rows)
+                inserted_sessions += len(session_rows)
+                session_rows = []
+
+        if user_rows:
+            conn.execute(insert(user_table), user_rows)
+        if session_rows:
+            conn.execute(insert(session_table), session_rows)
+            inserted_sessions += len(session_rows)
+
+    engine.dispose()
+    return {"users": users, "sessions": inserted_sessions, "seconds": time.perf_counter() - start}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default="sqlite:///./bench.db", help="Target database (tables are created if missing)")
+    parser.add_argument("--scale", choices=sorted(SCALES), help="Preset size; overrides --users and --sessions")
+    parser.add_argument("--users", type=int, default=1_000)
+    parser.add_argument("--sessions", type=int, default=10_000)
+    parser.add_argument("--skew", type=float, default=1.2, help="Pareto shape for sessions per user; 0 for uniform")
+    parser.add_argument("--expired-fraction", type=float, default=0.2)
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    users, sessions = SCALES[args.scale] if args.scale else (args.users, args.sessions)
+    result = generate(args.database_url, users, sessions, args.skew, args.expired_fraction, args.batch_size, args.seed)
+    print(f"Inserted {result['users']} users and {result['sessions']} sessions in {result['seconds']:.1f}s")
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,45 @@
 #!/usr/bin/env python3
 """
 Application runner for the Registration Backend API.
+
+Development (default): a single process, auto-reloading when DEBUG is on.
+Production: python run.py --production [--workers N] [--reuse-port]
 """
 
-import uvicorn
-from app.config import settings
+import argparse
+import os
+import sys
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run the Registration Backend API")
+    parser.add_argument("--production", action="store_true", help="Run multiple workers without the reloader")
+    parser.add_argument("--workers", type=int, help="Number of worker processes (default: WORKERS, or the CPU count within DB_MAX_CONNECTIONS)")
+    parser.add_argument("--reuse-port", action="store_true", help="Bind each worker with SO_REUSEPORT")
+    return parser.parse_args()
 
 if __name__ == "__main__":
-    uvicorn.run(
-        "app.main:app",
-        host="127.0.0.1",
-        port=8080,
-        reload=settings.DEBUG,
-        log_level="info"
-    )
+    args = parse_args()
+
+    # Settings are read at import time, so apply overrides before importing the app
+    if args.workers:
+        os.environ["WORKERS"] = str(args.workers)
+    if args.reuse_port:
+        os.environ["REUSE_PORT"] = "True"
+
+    from app.config import settings
+
+    if args.production:
+        from app.server import serve_production
+        try:
+            serve_production()
+        except (ValueError, RuntimeError) as e:
+            sys.exit(f"Error: {e}")
+    else:
+        import uvicorn
+        uvicorn.run(
+            "app.main:app",
+            host=settings.HOST,
+            port=settings.PORT,
+            reload=settings.DEBUG,
+            log_level="info"
+        )
@@ -0,0 +1,44 @@
+import os
+import tempfile
+
+# Settings are read at import time, so point the app at a throwaway database first
+_database_dir = tempfile.mkdtemp(prefix="registration-backend-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_database_dir, 'test.db')}"
+os.environ["SESSION_CLEANUP_INTERVAL_HOURS"] = "0"
+os.environ["CACHE_INVALIDATION_BACKEND"] = "memory"
+
+import pytest
+from fastapi.testclient import TestClient
+from app.database import Base, engine
+from app.main import create_app
+from app.utils.cache import session_cache, user_cache
+from app.utils.email_filter import email_filter
+
+PASSWORD = "Password1!"
+
+@pytest.fixture
+def client():
+    """Test client with the lifespan run, on empty tables and caches."""
+    with TestClient(create_app()) as test_client:
+        yield test_client
+    with engine.begin() as conn:
+        for table in reversed(Base.metadata.sorted_tables):
+            conn.execute(table.delete())
+    user_cache.clear()
+    session_cache.clear()
+    email_filter.ready = False
+
+def register(client: TestClient, email: str):
+    return client.post("/auth/register", json={
+        "firstName": "Test",
+        "lastName": "User",
+        "email": email,
+        "password": PASSWORD,
+        "confirmPassword": PASSWORD,
+    })
+
+def login(client: TestClient, email: str) -> dict:
+    """Log in and return the Authorization header."""
+    response = client.post("/auth/login", json={"email": email, "password": PASSWORD})
+    assert response.status_code == 200
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
@@ -0,0 +1,64 @@
+from types import SimpleNamespace
+from app.utils.cache import TTLCache, handle_invalidation, session_cache, user_cache
+from app.utils.invalidation import SESSION_REVOKED, USER_REVOKED
+
+def test_set_and_get():
+    cache = TTLCache(ttl=60, max_entries=10)
+    cache.set("key", "value", cache.generation)
+    assert cache.get("key") == "value"
+
+def test_stale_write_after_delete_is_dropped():
+    cache = TTLCache(ttl=60, max_entries=10)
+    generation = cache.generation  # Read started
+    cache.delete("key")  # Revoked while the read was in flight
+    cache.set("key", "stale", generation)
+    assert cache.get("key") is None
+
+def test_stale_write_after_delete_where_or_clear_is_dropped():
+    cache = TTLCache(ttl=60, max_entries=10)
+    generation = cache.generation
+    cache.delete_where(lambda value: False)
+    cache.set("a", "stale", generation)
+    assert cache.get("a") is None
+
+    generation = cache.generation
+    cache.clear()
+    cache.set("b", "stale", generation)
+    assert cache.get("b") is None
+
+    cache.set("c", "fresh", cache.generation)
+    assert cache.get("c") == "fresh"
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(ttl=60, max_entries=2)
+    cache.set("a", 1, cache.generation)
+    cache.set("b", 2, cache.generation)
+    cache.get("a")
+    cache.set("c", 3, cache.generation)
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+def test_zero_ttl_disables_the_cache():
+    cache = TTLCache(ttl=0, max_entries=10)
+    cache.set("key", "value", cache.generation)
+    assert cache.get("key") is None
+
+def test_user_revoked_drops_user_and_sessions():
+    user = SimpleNamespace(id="user-1")
+    session = SimpleNamespace(user_id="user-1")
+    other_session = SimpleNamespace(user_id="user-2")
+    user_cache.set("a@example.com", user, user_cache.generation)
+    session_cache.set("s1", session, session_cache.generation)
+    session_cache.set("s2", other_session, session_cache.generation)
+    try:
+        handle_invalidation(USER_REVOKED, "user-1")
+        assert user_cache.get("a@example.com") is None
+        assert session_cache.get("s1") is None
+        assert session_cache.get("s2") is other_session
+
+        handle_invalidation(SESSION_REVOKED, "s2")
+        assert session_cache.get("s2") is None
+    finally:
+        user_cache.clear()
+        session_cache.clear()
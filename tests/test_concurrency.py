@@ -0,0 +1,69 @@
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app import server
+from app.config import settings
+from app.database import SessionLocal, get_db
+from app.main import create_app
+from app.models.user import User
+from app.utils.auth import create_access_token
+from app.utils.cache import session_cache, user_cache
+
+@pytest.fixture
+def worker_app(client, monkeypatch):
+    """The app configured like one production worker on an 8-core machine with the default budget."""
+    with mock.patch("os.cpu_count", return_value=8), mock.patch.dict(os.environ, {"DB_MAX_CONNECTIONS": "20"}):
+        monkeypatch.setattr(settings, "WORKERS", 0)
+        monkeypatch.setattr(settings, "DB_MAX_CONNECTIONS", 20)
+        background = server.background_connections("unix")
+        resources = server.worker_resources(server.resolve_workers(background), background)
+    for name, value in resources.items():
+        monkeypatch.setattr(settings, name, value)
+    # Every request goes to the database
+    monkeypatch.setattr(user_cache, "ttl", 0)
+    monkeypatch.setattr(session_cache, "ttl", 0)
+
+    worker_engine = create_engine(
+        settings.DATABASE_URL,
+        connect_args={"check_same_thread": False},
+        pool_size=resources["DB_POOL_SIZE"],
+        max_overflow=resources["DB_MAX_OVERFLOW"],
+        pool_timeout=5,
+    )
+    WorkerSession = sessionmaker(autocommit=False, autoflush=False, bind=worker_engine)
+
+    def get_worker_db():
+        db = WorkerSession()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = create_app()
+    app.dependency_overrides[get_db] = get_worker_db
+    yield app
+    worker_engine.dispose()
+
+def make_users(count: int) -> list[dict]:
+    """Insert users and return an Authorization header for each."""
+    emails = [f"concurrent{i}@example.com" for i in range(count)]
+    db = SessionLocal()
+    try:
+        db.add_all(User(id=uuid.uuid4(), email=email, name="Test", hashed_password="x") for email in emails)
+        db.commit()
+    finally:
+        db.close()
+    return [{"Authorization": f"Bearer {create_access_token({'sub': email})}"} for email in emails]
+
+@pytest.mark.parametrize("path, concurrency", [("/auth/me", 8), ("/sessions/", 16)])
+def test_concurrent_requests_do_not_exhaust_the_pool(worker_app, path, concurrency):
+    headers = make_users(concurrency)
+    with TestClient(worker_app, raise_server_exceptions=False) as test_client:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            responses = list(executor.map(lambda h: test_client.get(path, headers=h), headers))
+    assert [response.status_code for response in responses] == [200] * concurrency
@@ -0,0 +1,39 @@
+from conftest import login, register
+
+def test_me_returns_304_for_current_etag(client):
+    register(client, "me@example.com")
+    headers = login(client, "me@example.com")
+
+    response = client.get("/auth/me", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["email"] == "me@example.com"
+    etag = response.headers["etag"]
+
+    response = client.get("/auth/me", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+    response = client.get("/auth/me", headers={**headers, "If-None-Match": '"stale"'})
+    assert response.status_code == 200
+    assert response.headers["etag"] == etag
+
+def test_sessions_etag_changes_with_the_session_set(client):
+    register(client, "sessions@example.com")
+    headers = login(client, "sessions@example.com")
+
+    response = client.get("/sessions/", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["total"] == 1
+    etag = response.headers["etag"]
+
+    response = client.get("/sessions/", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+
+    # A new login adds a session, so the old ETag no longer matches
+    login(client, "sessions@example.com")
+    response = client.get("/sessions/", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["total"] == 2
+    assert response.headers["etag"] != etag
@@ -0,0 +1,109 @@
+import threading
+import time
+import uuid
+import pytest
+from fastapi.testclient import TestClient
+from app.config import settings
+from app.database import SessionLocal
+from app.main import create_app
+from app.models.user import User
+from app.utils.email_filter import BloomFilter, EmailFilter, email_filter
+from conftest import register
+
+def add_users(emails):
+    """Insert users directly, bypassing registration and the bus."""
+    db = SessionLocal()
+    try:
+        db.add_all(User(id=uuid.uuid4(), email=email, name="Test", hashed_password="x") for email in emails)
+        db.commit()
+    finally:
+        db.close()
+
+@pytest.fixture
+def built_filter(client):
+    """The app's email filter once the startup build has finished."""
+    deadline = time.monotonic() + 5
+    while not email_filter.ready:
+        assert time.monotonic() < deadline, "email filter was not built"
+        time.sleep(0.01)
+    return email_filter
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    items = [f"user{i}@example.com" for i in range(1000)]
+    for item in items:
+        bloom.add(item)
+    assert all(item in bloom for item in items)
+    false_positives = sum(f"other{i}@example.com" in bloom for i in range(1000))
+    assert false_positives < 50
+
+def test_build_grows_the_filter_without_false_negatives(client):
+    emails = [f"user{i}@example.com" for i in range(300)]
+    add_users(emails)
+
+    email_filter_under_test = EmailFilter(capacity=10, error_rate=0.01)
+    assert email_filter_under_test.build(batch_size=16) == 300
+    assert email_filter_under_test.capacity >= 600
+    assert email_filter_under_test.ready
+    assert all(email_filter_under_test.might_contain(email) for email in emails)
+
+def test_build_stops_when_asked(client):
+    add_users([f"user{i}@example.com" for i in range(50)])
+    stop_event = threading.Event()
+    stop_event.set()
+
+    email_filter_under_test = EmailFilter(capacity=10, error_rate=0.01)
+    email_filter_under_test.build(batch_size=16, stop_event=stop_event)
+    assert not email_filter_under_test.ready
+    assert email_filter_under_test.might_contain("anyone@example.com")
+
+def test_email_available_before_filter_is_ready(client, built_filter):
+    add_users(["taken@example.com"])
+    built_filter.ready = False
+
+    response = client.get("/auth/email-available", params={"email": "taken@example.com"})
+    assert response.json() == {"email": "taken@example.com", "available": False}
+    response = client.get("/auth/email-available", params={"email": "free@example.com"})
+    assert response.json() == {"email": "free@example.com", "available": True}
+
+def test_email_available_after_filter_is_ready(client, built_filter):
+    assert register(client, "registered@example.com").status_code == 201
+    response = client.get("/auth/email-available", params={"email": "registered@example.com"})
+    assert response.json()["available"] is False
+
+    # Inserted behind the filter's back: a ready filter answers without asking the database
+    add_users(["unseen@example.com"])
+    response = client.get("/auth/email-available", params={"email": "unseen@example.com"})
+    assert response.json()["available"] is True
+
+def test_register_duplicate_rejected_by_unique_index(client, built_filter, monkeypatch):
+    assert register(client, "dup@example.com").status_code == 201
+    # Skip the pre-check so the insert hits the unique index
+    monkeypatch.setattr(built_filter, "might_contain", lambda email: False)
+
+    response = register(client, "dup@example.com")
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Email already registered"
+
+    db = SessionLocal()
+    try:
+        assert db.query(User).filter(User.email == "dup@example.com").count() == 1
+    finally:
+        db.close()
+
+def test_filter_build_does_not_hold_a_request_thread(monkeypatch):
+    started, finish = threading.Event(), threading.Event()
+
+    def slow_build(batch_size=10000, stop_event=None):
+        started.set()
+        finish.wait(10)
+        return 0
+
+    monkeypatch.setattr(email_filter, "build", slow_build)
+    monkeypatch.setattr(settings, "THREADPOOL_SIZE", 1)
+    with TestClient(create_app()) as test_client:
+        assert started.wait(5)
+        start = time.monotonic()
+        assert test_client.get("/health").status_code == 200
+        assert time.monotonic() - start < 2
+        finish.set()
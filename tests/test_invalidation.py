@@ -0,0 +1,134 @@
+import os
+import threading
+import pytest
+from sqlalchemy import create_engine, insert
+from app.config import settings
+from app.database import Base, engine
+from app.models.cache_invalidation import CacheInvalidation
+from app.utils.invalidation import (
+    create_invalidation_bus, DatabaseInvalidationBus, MemoryInvalidationBus, UnixSocketInvalidationBus, SESSION_REVOKED, USER_REVOKED
+)
+
+class Recorder:
+    """Handler that records events and lets tests wait for them."""
+
+    def __init__(self):
+        self.events = []
+        self.received = threading.Event()
+
+    def __call__(self, kind, key):
+        self.events.append((kind, key))
+        self.received.set()
+
+@pytest.fixture
+def database_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'bus.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine, tables=[CacheInvalidation.__table__])
+    yield engine
+    engine.dispose()
+
+def test_memory_bus_delivers_locally():
+    bus = MemoryInvalidationBus()
+    recorder = Recorder()
+    bus.subscribe(recorder)
+    bus.start()
+    bus.publish(SESSION_REVOKED, "abc")
+    assert recorder.events == [(SESSION_REVOKED, "abc")]
+
+@pytest.mark.skipif(not hasattr(__import__("socket"), "AF_UNIX"), reason="needs Unix sockets")
+def test_unix_bus_round_trip(tmp_path):
+    publisher = UnixSocketInvalidationBus(str(tmp_path))
+    subscriber = UnixSocketInvalidationBus(str(tmp_path))
+    # Both live in this process, so give them distinct socket paths
+    publisher.path = os.path.join(tmp_path, "publisher.sock")
+    subscriber.path = os.path.join(tmp_path, "subscriber.sock")
+    local, remote = Recorder(), Recorder()
+    publisher.subscribe(local)
+    subscriber.subscribe(remote)
+    publisher.start()
+    subscriber.start()
+    try:
+        publisher.publish(USER_REVOKED, "user-1")
+        assert remote.received.wait(5)
+        assert remote.events == [(USER_REVOKED, "user-1")]
+        assert local.events == [(USER_REVOKED, "user-1")]
+    finally:
+        publisher.stop()
+        subscriber.stop()
+
+def test_database_bus_round_trip(database_engine):
+    publisher = DatabaseInvalidationBus(database_engine, poll_interval=3600)
+    subscriber = DatabaseInvalidationBus(database_engine, poll_interval=3600)
+    local, remote = Recorder(), Recorder()
+    publisher.subscribe(local)
+    subscriber.subscribe(remote)
+    publisher.start()
+    subscriber.start()
+    try:
+        publisher.publish(SESSION_REVOKED, "abc")
+        assert subscriber.poll() == 1
+        assert remote.events == [(SESSION_REVOKED, "abc")]
+        # The publisher skips its own row when it polls
+        publisher.poll()
+        assert local.events == [(SESSION_REVOKED, "abc")]
+        assert subscriber.poll() == 0
+    finally:
+        publisher.stop()
+        subscriber.stop()
+
+def test_database_bus_delivers_rows_committed_out_of_order(database_engine):
+    subscriber = DatabaseInvalidationBus(database_engine, poll_interval=3600)
+    recorder = Recorder()
+    subscriber.subscribe(recorder)
+    subscriber.start()
+    table = subscriber.table
+    try:
+        # Id 2 belongs to a transaction that commits after id 3 is polled
+        with database_engine.begin() as conn:
+            conn.execute(insert(table).values(id=1, kind=SESSION_REVOKED, key="1", origin="other"))
+            conn.execute(insert(table).values(id=3, kind=SESSION_REVOKED, key="3", origin="other"))
+        subscriber.poll()
+        with database_engine.begin() as conn:
+            conn.execute(insert(table).values(id=2, kind=SESSION_REVOKED, key="2", origin="other"))
+        subscriber.poll()
+        subscriber.poll()
+        assert [key for _, key in recorder.events] == ["1", "3", "2"]
+    finally:
+        subscriber.stop()
+
+def test_database_bus_forgets_gaps_after_timeout(database_engine, monkeypatch):
+    subscriber = DatabaseInvalidationBus(database_engine, poll_interval=3600)
+    subscriber.start()
+    try:
+        with database_engine.begin() as conn:
+            conn.execute(insert(subscriber.table).values(id=5, kind=SESSION_REVOKED, key="5", origin="other"))
+        subscriber.poll()
+        assert set(subscriber._gaps) == {1, 2, 3, 4}
+        monkeypatch.setattr(DatabaseInvalidationBus, "GAP_TIMEOUT", -1)
+        subscriber.poll()
+        assert subscriber._gaps == {}
+    finally:
+        subscriber.stop()
+
+def test_bus_falls_back_to_local_delivery_when_start_fails(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'empty.db'}")  # No cache_invalidations table
+    bus = DatabaseInvalidationBus(engine, poll_interval=3600)
+    recorder = Recorder()
+    bus.subscribe(recorder)
+    bus.start()
+    try:
+        assert bus.local_only
+        bus.publish(SESSION_REVOKED, "abc")
+        assert recorder.events == [(SESSION_REVOKED, "abc")]
+    finally:
+        bus.stop()
+        engine.dispose()
+
+def test_database_bus_uses_its_own_connection(monkeypatch):
+    monkeypatch.setattr(settings, "CACHE_INVALIDATION_BACKEND", "database")
+    bus = create_invalidation_bus()
+    try:
+        assert bus.engine is not engine
+        assert bus.engine.pool.size() == 1
+    finally:
+        bus.engine.dispose()
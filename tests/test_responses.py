@@ -0,0 +1,34 @@
+import pytest
+from starlette.requests import Request
+from app.utils.responses import compute_etag, etag_matches
+
+ETAG = compute_etag("me", "user-1")
+
+def make_request(if_none_match=None) -> Request:
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match is not None else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+def test_compute_etag_is_quoted_and_stable():
+    assert ETAG.startswith('"') and ETAG.endswith('"')
+    assert compute_etag("me", "user-1") == ETAG
+    assert compute_etag("me", "user-2") != ETAG
+
+@pytest.mark.parametrize("header", [
+    ETAG,
+    f"W/{ETAG}",
+    "*",
+    f'"other", {ETAG}',
+    f'"other",W/{ETAG} , "another"',
+])
+def test_etag_matches(header):
+    assert etag_matches(make_request(header), ETAG)
+
+@pytest.mark.parametrize("header", [
+    None,
+    "",
+    '"other"',
+    '"other", W/"another"',
+    ETAG.strip('"'),  # Unquoted
+])
+def test_etag_does_not_match(header):
+    assert not etag_matches(make_request(header), ETAG)